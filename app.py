@@ -12,14 +12,86 @@ from modules.link.link_ui import LinkUI
 from modules.file.file_ui import FileUI
 from modules.link.link_service import LinkService
 from modules.file.file_service import FileService
-from config.config import APP_TITLE, APP_ICON, APP_LAYOUT
-import os
+from config.config import APP_TITLE, APP_ICON, APP_LAYOUT, HAS_OPENAI_API_KEY, HAS_TAVILY_API_KEY
 import streamlit as st
 
 
 torch.classes.__path__ = []
 
 
+HOW_TO_USE_MARKDOWN = """#### How to Use This Application
+
+1. **Upload Content** - Add files and links through the sidebar panel on the left handside.
+
+2. **Save Your Content** - Click "Upload Selected Files" or "Add Link" to save content to the database.
+
+3. **Select Sources** - In both "One AI" and "Agents AI" tabs, select your files and/or links from the dropdown menu.
+
+4. **Build Index** - Click "Build Index" to vectorize your content. This step is mandatory before interacting with your files or links.
+
+5. **Ask Questions** - Enter your questions to receive answers from your documents. You can compare responses by asking the same question in both AI interfaces.
+
+6. **Manage Sources** - Use the "Source Management" tab to view or delete your uploaded content if needed.
+
+7. **Download History** - Export your conversation history using the download button in each AI tab.
+
+8. **Provide Feedback** - Share your experience in the "Feedback" section, which is mandatory after using the application."""
+
+
+@st.cache_resource
+def get_auth_service() -> AuthService:
+    """Create the AuthService once per worker."""
+    return AuthService()
+
+
+@st.cache_resource
+def get_file_service() -> FileService:
+    """Create the FileService once per worker."""
+    return FileService()
+
+
+@st.cache_resource
+def get_link_service() -> LinkService:
+    """Create the LinkService once per worker."""
+    return LinkService()
+
+
+@st.cache_resource
+def get_feedback_service() -> FeedbackService:
+    """Create the FeedbackService once per worker."""
+    return FeedbackService()
+
+
+@st.cache_resource
+def get_file_ui() -> FileUI:
+    """Create the FileUI once per worker."""
+    return FileUI(get_file_service())
+
+
+@st.cache_resource
+def get_link_ui() -> LinkUI:
+    """Create the LinkUI once per worker."""
+    return LinkUI(get_link_service())
+
+
+@st.cache_resource
+def get_feedback_ui() -> FeedbackUI:
+    """Create the FeedbackUI once per worker."""
+    return FeedbackUI(get_feedback_service(), get_auth_service())
+
+
+@st.cache_resource
+def get_conventional_ui() -> ConventionalUI:
+    """Create the ConventionalUI once per worker."""
+    return ConventionalUI(get_file_service(), get_link_service())
+
+
+@st.cache_resource
+def get_langgraph_ui() -> LangGraphUI:
+    """Create the LangGraphUI once per worker."""
+    return LangGraphUI(get_file_service(), get_link_service())
+
+
 def setup_page_config():
     """Configure the Streamlit page settings."""
     st.set_page_config(
@@ -32,12 +104,12 @@ def setup_page_config():
 def setup_environment_variables():
     """Check for required environment variables."""
     # Check for OpenAI API key
-    if "OPENAI_API_KEY" not in os.environ:
+    if not HAS_OPENAI_API_KEY:
         st.sidebar.warning(
             "⚠️ OPENAI_API_KEY not set in environment. Some AI features may not work.")
 
     # Check for Tavily API key
-    if "TAVILY_API_KEY" not in os.environ:
+    if not HAS_TAVILY_API_KEY:
         st.sidebar.warning(
             "⚠️ TAVILY_API_KEY not set in environment. Web search functionality will be limited.")
 
@@ -47,18 +119,15 @@ def main():
     setup_page_config()
 
     # Initialize services
-    auth_service = AuthService()
-    file_service = FileService()
-    link_service = LinkService()
-    feedback_service = FeedbackService()
+    file_service = get_file_service()
 
     # Initialize UI components
-    auth_ui = AuthUI(auth_service)
-    file_ui = FileUI(file_service)
-    link_ui = LinkUI(link_service)
-    feedback_ui = FeedbackUI(feedback_service, auth_service)
-    conventional_ui = ConventionalUI(file_service, link_service)
-    langgraph_ui = LangGraphUI(file_service, link_service)
+    # AuthUI wraps a per-session cookie component, so it is not shared
+    auth_ui = AuthUI(get_auth_service())
+    file_ui = get_file_ui()
+    link_ui = get_link_ui()
+    feedback_ui = get_feedback_ui()
+    conventional_ui = get_conventional_ui()
 
     # Check if user is authenticated
     if not auth_ui.is_authenticated():
@@ -76,23 +145,7 @@ def main():
     # Main page title
     st.title("AMA")
     st.write("### Artificial Maintenance Agent")
-    st.write("""#### How to Use This Application
-
-1. **Upload Content** - Add files and links through the sidebar panel on the left handside.
-
-2. **Save Your Content** - Click "Upload Selected Files" or "Add Link" to save content to the database.
-
-3. **Select Sources** - In both "One AI" and "Agents AI" tabs, select your files and/or links from the dropdown menu.
-
-4. **Build Index** - Click "Build Index" to vectorize your content. This step is mandatory before interacting with your files or links.
-
-5. **Ask Questions** - Enter your questions to receive answers from your documents. You can compare responses by asking the same question in both AI interfaces.
-
-6. **Manage Sources** - Use the "Source Management" tab to view or delete your uploaded content if needed.
-
-7. **Download History** - Export your conversation history using the download button in each AI tab.
-
-8. **Provide Feedback** - Share your experience in the "Feedback" section, which is mandatory after using the application.""")
+    st.markdown(HOW_TO_USE_MARKDOWN)
 
     # Sidebar for user info, logout, file upload, and link management
     with st.sidebar:
@@ -113,39 +166,59 @@ def main():
                 submit_button = st.form_submit_button("Upload Selected Files")
 
                 if submit_button and uploaded_files:
+                    # Get existing files once, indexed by name to check for duplicates
+                    existing_by_name = {
+                        f.name: f for f in file_service.get_user_files(current_user.user_id)}
+
+                    # Files to add, stored together once duplicates are handled
+                    pending_files = []
+                    pending_names = set()
+
+                    # File names per outcome, reported once after the upload
+                    repeated_names = []
+                    skipped_names = []
+                    replace_file_ids = {}
+
                     for uploaded_file in uploaded_files:
-                        # Get existing files to check for duplicates
-                        existing_files = file_service.get_user_files(
-                            current_user.user_id)
-                        duplicate = any(
-                            f.name == uploaded_file.name for f in existing_files)
+                        if uploaded_file.name in pending_names:
+                            repeated_names.append(uploaded_file.name)
+                            continue
+
+                        duplicate = existing_by_name.get(uploaded_file.name)
 
                         # Handle duplicates based on user preference
                         if duplicate and not replace_existing:
-                            st.warning(
-                                f"File '{uploaded_file.name}' already exists. Select 'Replace existing files' option to overwrite.")
+                            skipped_names.append(uploaded_file.name)
                             continue
                         elif duplicate and replace_existing:
-                            # Delete existing file with the same name
-                            for existing_file in existing_files:
-                                if existing_file.name == uploaded_file.name:
-                                    file_service.delete_file(existing_file.id)
-                                    st.info(
-                                        f"Replacing existing file: {uploaded_file.name}")
-                                    break
-
-                        # Add file to service
-                        file_model = file_service.add_file(
-                            file=uploaded_file.getbuffer(),
-                            filename=uploaded_file.name,
-                            file_type=uploaded_file.type,
-                            user_id=current_user.user_id
-                        )
-
-                        if file_model:
-                            st.success(f"Uploaded: {uploaded_file.name}")
-                        else:
-                            st.error(f"Failed to upload: {uploaded_file.name}")
+                            # Replace existing file with the same name once the new one is stored
+                            replace_file_ids[uploaded_file.name] = duplicate.id
+
+                        pending_files.append(
+                            (uploaded_file.getbuffer(), uploaded_file.name, uploaded_file.type))
+                        pending_names.add(uploaded_file.name)
+
+                    # Add files to service
+                    file_models = file_service.add_files_bulk(
+                        pending_files, user_id=current_user.user_id, replace_file_ids=replace_file_ids)
+                    uploaded_names = [f.name for f in file_models]
+                    replaced_names = [
+                        name for name in uploaded_names if name in replace_file_ids]
+                    failed_names = sorted(pending_names.difference(uploaded_names))
+
+                    if repeated_names:
+                        st.warning(
+                            f"Selected more than once, only the first one is uploaded: {', '.join(repeated_names)}")
+                    if skipped_names:
+                        st.warning(
+                            f"Already exist, select 'Replace existing files' option to overwrite: {', '.join(skipped_names)}")
+                    if replaced_names:
+                        st.info(
+                            f"Replaced existing files: {', '.join(replaced_names)}")
+                    if uploaded_names:
+                        st.success(f"Uploaded: {', '.join(uploaded_names)}")
+                    if failed_names:
+                        st.error(f"Failed to upload: {', '.join(failed_names)}")
         else:
             st.warning("Please log in to upload files")
 
@@ -164,7 +237,7 @@ def main():
         conventional_ui.render_query_section(current_user)
 
     with langgraphTab:
-        langgraph_ui.render_langgraph_section(current_user)
+        get_langgraph_ui().render_langgraph_section(current_user)
 
     with sourceManagementTab:
         file_ui.render_file_management(current_user)
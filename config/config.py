@@ -16,5 +16,16 @@ APP_LAYOUT = "wide"
 
 # AUTH Config
 SESSION_DURATION_IN_DAYS = 1
+SESSION_REVALIDATION_INTERVAL_IN_SECONDS = 300
+
+# Sources Config
+SOURCES_CACHE_TTL_IN_SECONDS = 60
+
+# Chat Config
+CHAT_HISTORY_VISIBLE_TURNS = 10
 
 CHROMA_PATH = os.path.join(BASE_DIR, ".chroma")
+
+# API keys are set before the app starts, so their presence is checked once
+HAS_OPENAI_API_KEY = "OPENAI_API_KEY" in os.environ
+HAS_TAVILY_API_KEY = "TAVILY_API_KEY" in os.environ
@@ -35,7 +35,7 @@ def spare_parts_extraction_decision_maker(state) -> str:
         return WEBSEARCH
 
 
-def get_graph():
+def get_graph(draw: bool = False):
     workflow = StateGraph(GraphState)
     workflow.add_node(RETRIEVE_AND_GRADE, retrieve)
     workflow.add_node(GENERATE, generate)
@@ -67,7 +67,10 @@ def get_graph():
 
 
     app = workflow.compile()
-    app.get_graph().draw_mermaid_png(output_file_path="graph.png")
-    print(app.get_graph().draw_mermaid())
+
+    # Rendering the PNG goes through the mermaid.ink API, so only do it on request
+    if draw:
+        app.get_graph().draw_mermaid_png(output_file_path="graph.png")
+        print(app.get_graph().draw_mermaid())
 
     return app
@@ -181,6 +181,9 @@ class AuthService:
             created_at = datetime.now().isoformat()
             expires_at = (datetime.now() + timedelta(days=SESSION_DURATION_IN_DAYS)).isoformat()
 
+            # Purge expired sessions on login, the service itself is created once per worker
+            self.delete_expired_sessions()
+
             with db_conenciton() as cursor:
                 # Insert session into database
                 cursor.execute(
@@ -193,12 +196,13 @@ class AuthService:
             print(f"Error creating session: {e}")
             return None
 
-    def validate_session(self, session_id: str) -> Optional[User]:
+    def validate_session(self, session_id: str, raise_on_error: bool = False) -> Optional[User]:
         """
         Validate a session and return the associated user.
 
         Args:
             session_id: The session ID to validate
+            raise_on_error: If True, raise lookup errors instead of treating the session as invalid
 
         Returns:
             Optional[User]: The user associated with the session or None if invalid
@@ -225,6 +229,8 @@ class AuthService:
             return None
         except Exception as e:
             print(f"Error validating session: {e}")
+            if raise_on_error:
+                raise
             return None
 
     def delete_session(self, session_id: str) -> bool:
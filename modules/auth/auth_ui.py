@@ -1,14 +1,17 @@
 """
 UI components for authentication in the Streamlit application.
 """
+import time
 import streamlit as st
 from typing import Optional
 
+from config.config import SESSION_REVALIDATION_INTERVAL_IN_SECONDS
 from modules.auth.auth_service import AuthService, User
 from streamlit_cookies_controller import CookieController
 
 SESSION_STATE_KEY = "authenticated_user"
 SESSION_ID_KEY = "session_id"
+SESSION_VALIDATED_AT_KEY = "session_validated_at"
 
 
 class AuthUI:
@@ -44,22 +47,34 @@ class AuthUI:
         Returns:
             bool: True if authenticated, False otherwise
         """
-        # Check if user is in session state
-        if SESSION_STATE_KEY in st.session_state:
-            return True
+        # Trust the user in session state until the session is due for revalidation
+        is_cached = SESSION_STATE_KEY in st.session_state
+        if is_cached:
+            validated_at = st.session_state.get(SESSION_VALIDATED_AT_KEY, 0.0)
+            if time.monotonic() - validated_at < SESSION_REVALIDATION_INTERVAL_IN_SECONDS:
+                return True
 
         self.sync_session_id()
 
         # Check if session ID is in session state
         if SESSION_ID_KEY in st.session_state:
             session_id = st.session_state[SESSION_ID_KEY]
-            user = self.auth_service.validate_session(session_id)
+            try:
+                user = self.auth_service.validate_session(
+                    session_id, raise_on_error=is_cached)
+            except Exception:
+                # Keep the cached user on a failed lookup and retry on the next interval
+                st.session_state[SESSION_VALIDATED_AT_KEY] = time.monotonic()
+                return True
 
             if user:
                 # Store user in session state
                 st.session_state[SESSION_STATE_KEY] = user
+                st.session_state[SESSION_VALIDATED_AT_KEY] = time.monotonic()
                 return True
 
+        # The session expired or was removed since it was last validated
+        st.session_state.pop(SESSION_STATE_KEY, None)
         return False
 
     def get_current_user(self) -> Optional[User]:
@@ -115,6 +130,7 @@ class AuthUI:
                             # Store in session state
                             st.session_state[SESSION_STATE_KEY] = user
                             st.session_state[SESSION_ID_KEY] = session_id
+                            st.session_state[SESSION_VALIDATED_AT_KEY] = time.monotonic()
                             self.sync_session_id()
                             st.rerun()
                         else:
@@ -140,6 +156,7 @@ class AuthUI:
             # Clear session state
             if SESSION_STATE_KEY in st.session_state:
                 del st.session_state[SESSION_STATE_KEY]
+            st.session_state.pop(SESSION_VALIDATED_AT_KEY, None)
 
             st.rerun()
 
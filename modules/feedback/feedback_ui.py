@@ -39,6 +39,7 @@ class FeedbackUI:
 
         return json.dumps(data, indent=4)
 
+    @st.fragment
     def render_feedback_form(self, current_user: Optional[User] = None, is_admin: bool = False) -> None:
         """
         Render the feedback from interface.
@@ -3,16 +3,40 @@ Service for managing file operations in the application.
 """
 import os
 import pathlib
+import shutil
 import streamlit as st
 import uuid
-from typing import List, Optional, BinaryIO, Union
+from psycopg2.extras import execute_values
+from typing import Dict, List, Optional, BinaryIO, Tuple, Union
 from datetime import datetime
 
 from modules.file.file_model import FileModel
-from config.config import UPLOAD_DIR
+from config.config import SOURCES_CACHE_TTL_IN_SECONDS, UPLOAD_DIR
 from utils.db_conenciton import db_conenciton, get_supabase_client
 from modules.file.file_utils import delete_file
 
+FILE_COPY_CHUNK_SIZE = 1024 * 1024  # 1 MB
+
+
+@st.cache_data(ttl=SOURCES_CACHE_TTL_IN_SECONDS, show_spinner=False)
+def _get_cached_user_files(_file_service: "FileService", user_id: str) -> List[FileModel]:
+    """Cache the files of a user, the service argument is excluded from the cache key."""
+    return _file_service._query_user_files(user_id)
+
+
+@st.cache_data(ttl=SOURCES_CACHE_TTL_IN_SECONDS, show_spinner=False)
+def _get_cached_user_file_options(_file_service: "FileService", user_id: str) -> Tuple[Tuple[str, ...], Dict[str, FileModel]]:
+    """Cache the file names of a user along with the files they select."""
+    options = {file.name: file for file in _get_cached_user_files(_file_service, user_id)}
+    return tuple(options), options
+
+
+def _clear_user_files_cache() -> None:
+    """Clear the cached files of all users after a change."""
+    _get_cached_user_files.clear()
+    _get_cached_user_file_options.clear()
+
+
 class FileService:
     """
     Service for managing file operations.
@@ -60,72 +84,156 @@ class FileService:
         Returns:
             Optional[FileModel]: The added file model or None if failed
         """
-        try:
-            # Generate a unique ID for the file
-            file_id = str(uuid.uuid4())
-
-            # Create user-specific directory
-            user_upload_dir = os.path.join(UPLOAD_DIR, user_id) if user_id else UPLOAD_DIR
-            os.makedirs(user_upload_dir, exist_ok=True)
-
-            file_name = f"{file_id}_{filename}"
-            file_path = os.path.join(user_upload_dir, file_name)
-            file_relative_path = f"{user_id}/{file_name}"
-
-            # Save the file - handle different types of inputs
-            with open(file_path, "wb") as f:
-                if hasattr(file, 'read'):
-                    # If it's a file-like object
-                    content = file.read()
-                elif isinstance(file, (bytes, bytearray, memoryview)):
-                    # If it's binary data
-                    content = file
-                else:
-                    raise TypeError(f"Unsupported file type: {type(file)}")
+        file_models = self.add_files_bulk([(file, filename, file_type)], user_id)
+        return file_models[0] if file_models else None
 
-                f.write(content)
+    def add_files_bulk(self, files: List[Tuple[Union[BinaryIO, bytes, bytearray, memoryview], str, str]],
+                       user_id: str = "", replace_file_ids: Optional[Dict[str, str]] = None) -> List[FileModel]:
+        """
+        Add several files to the system, registering them in a single database transaction.
 
-            self.bucket.upload(
-                file=pathlib.Path(file_path),
-                path=file_relative_path,
-                file_options={"cache-control": "86400", "upsert": "false"} # 86400 is 1 day
-            )
+        Args:
+            files: List of (file, filename, file_type) tuples, where file is a file-like object or bytes data
+            user_id: ID of the user who owns the files
+            replace_file_ids: IDs of existing files to replace, mapped by the name of the new file
 
-            # Get file size
-            file_size = os.path.getsize(file_path)
-
-            # Current timestamp
-            uploaded_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-            # Create file model
-            file_model = FileModel(
-                id=file_id,
-                name=filename,
-                path=file_path,
-                size=file_size,
-                type=file_type,
-                uploaded_at=uploaded_at,
-                user_id=user_id
-            )
+        Returns:
+            List[FileModel]: The added file models, files that failed to save are left out
+        """
+        saved_files = []
+        for file, filename, file_type in files:
+            try:
+                saved_files.append(self._save_file(file, filename, file_type, user_id))
+            except Exception as e:
+                print(f"Error adding file: {e}")
+
+        if not saved_files:
+            return []
+
+        # Only replace files whose new version was saved
+        saved_names = {file_model.name for file_model, _ in saved_files}
+        replaced_ids = [file_id for filename, file_id in (replace_file_ids or {}).items()
+                        if filename in saved_names]
 
-            # Save to database
+        try:
+            # Save to database, removing the replaced files in the same transaction
             with db_conenciton() as cursor:
-                cursor.execute(
+                execute_values(
+                    cursor,
                     """
                     INSERT INTO files
                     (file_id, user_id, name, path, size, type, uploaded_at)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
+                    VALUES %s
                     """,
-                    (
-                        file_id, user_id, filename, file_relative_path,
-                        file_size, file_type, uploaded_at
-                    )
+                    [
+                        (
+                            file_model.id, user_id, file_model.name, file_relative_path,
+                            file_model.size, file_model.type, file_model.uploaded_at
+                        )
+                        for file_model, file_relative_path in saved_files
+                    ]
                 )
 
-            return file_model
+                replaced_paths = []
+                if replaced_ids:
+                    cursor.execute(
+                        "DELETE FROM files WHERE file_id = ANY(%s) RETURNING path",
+                        (replaced_ids,)
+                    )
+                    replaced_paths = [row[0] for row in cursor.fetchall()]
         except Exception as e:
-            print(f"Error adding file: {e}")
-            return None
+            print(f"Error adding files: {e}")
+            # Nothing was registered, remove the files saved for this batch
+            self._remove_stored_files([file_relative_path for _, file_relative_path in saved_files])
+            return []
+
+        # The replaced files are only removed once the new ones are registered
+        self._remove_stored_files(replaced_paths)
+
+        _clear_user_files_cache()
+
+        return [file_model for file_model, _ in saved_files]
+
+    def _remove_stored_files(self, file_paths: List[str]) -> None:
+        """
+        Remove files from the local storage and the bucket.
+
+        Args:
+            file_paths: Relative paths of the files
+        """
+        if not file_paths:
+            return
+
+        try:
+            for file_path in file_paths:
+                absolute_path = os.path.join(UPLOAD_DIR, file_path)
+                if os.path.exists(absolute_path):
+                    delete_file(absolute_path)
+
+            self.bucket.remove(file_paths)
+        except Exception as e:
+            print(f"Error removing stored files: {e}")
+
+    def _save_file(self, file: Union[BinaryIO, bytes, bytearray, memoryview],
+                   filename: str, file_type: str, user_id: str) -> Tuple[FileModel, str]:
+        """
+        Save a file locally and to the bucket, without registering it in the database.
+
+        Args:
+            file: File-like object or bytes data to save
+            filename: Name of the file
+            file_type: MIME type of the file
+            user_id: ID of the user who owns the file
+
+        Returns:
+            Tuple[FileModel, str]: The file model and the relative path of the file in the bucket
+        """
+        # Generate a unique ID for the file
+        file_id = str(uuid.uuid4())
+
+        # Create user-specific directory
+        user_upload_dir = os.path.join(UPLOAD_DIR, user_id) if user_id else UPLOAD_DIR
+        os.makedirs(user_upload_dir, exist_ok=True)
+
+        file_name = f"{file_id}_{filename}"
+        file_path = os.path.join(user_upload_dir, file_name)
+        file_relative_path = f"{user_id}/{file_name}"
+
+        # Save the file - handle different types of inputs
+        with open(file_path, "wb") as f:
+            if hasattr(file, 'read'):
+                # If it's a file-like object, copy it in chunks instead of reading it whole
+                shutil.copyfileobj(file, f, FILE_COPY_CHUNK_SIZE)
+            elif isinstance(file, (bytes, bytearray, memoryview)):
+                # If it's binary data
+                f.write(file)
+            else:
+                raise TypeError(f"Unsupported file type: {type(file)}")
+
+        self.bucket.upload(
+            file=pathlib.Path(file_path),
+            path=file_relative_path,
+            file_options={"cache-control": "86400", "upsert": "false"} # 86400 is 1 day
+        )
+
+        # Get file size
+        file_size = os.path.getsize(file_path)
+
+        # Current timestamp
+        uploaded_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        # Create file model
+        file_model = FileModel(
+            id=file_id,
+            name=filename,
+            path=file_path,
+            size=file_size,
+            type=file_type,
+            uploaded_at=uploaded_at,
+            user_id=user_id
+        )
+
+        return file_model, file_relative_path
 
     def _relative_from_absolute_path(self, file_path: str) -> str:
         """
@@ -208,7 +316,7 @@ class FileService:
 
     def get_user_files(self, user_id: str) -> List[FileModel]:
         """
-        Get all files for a specific user.
+        Get all files for a specific user, cached for a short time.
 
         Args:
             user_id: ID of the user
@@ -217,44 +325,72 @@ class FileService:
             List[FileModel]: List of file models
         """
         try:
-            with db_conenciton() as cursor:
-                cursor.execute(
-                    """
-                    SELECT file_id, user_id, name, path, size, type, uploaded_at
-                    FROM files
-                    WHERE user_id = %s
-                    ORDER BY uploaded_at DESC
-                    """,
-                    (user_id,)
-                )
+            return _get_cached_user_files(self, user_id)
+        except Exception as e:
+            print(f"Error getting user files: {e}")
+            return []
 
-                rows = cursor.fetchall()
+    def get_user_file_options(self, user_id: str) -> Tuple[Tuple[str, ...], Dict[str, FileModel]]:
+        """
+        Get the file names of a specific user to select from, cached for a short time.
 
-            files = []
-            for row in rows:
-                file_id, user_id, name, path, size, type, uploaded_at = row
+        Args:
+            user_id: ID of the user
 
-                file_path = self._sync_file_with_bucket(path)
+        Returns:
+            Tuple[Tuple[str, ...], Dict[str, FileModel]]: The file names and the files mapped by name
+        """
+        try:
+            return _get_cached_user_file_options(self, user_id)
+        except Exception as e:
+            print(f"Error getting user file options: {e}")
+            return (), {}
 
-                # Check if file exists on disk
-                if os.path.exists(file_path):
-                    files.append(FileModel(
-                        id=file_id,
-                        name=name,
-                        path=file_path,
-                        size=size,
-                        type=type,
-                        uploaded_at=uploaded_at,
-                        user_id=user_id
-                    ))
-                else:
-                    # File doesn't exist on disk, delete from database
-                    self.delete_file(file_id)
+    def _query_user_files(self, user_id: str) -> List[FileModel]:
+        """
+        Query the database for all files of a specific user, raising on failure so errors are not cached.
 
-            return files
-        except Exception as e:
-            print(f"Error getting user files: {e}")
-            return []
+        Args:
+            user_id: ID of the user
+
+        Returns:
+            List[FileModel]: List of file models
+        """
+        with db_conenciton() as cursor:
+            cursor.execute(
+                """
+                SELECT file_id, user_id, name, path, size, type, uploaded_at
+                FROM files
+                WHERE user_id = %s
+                ORDER BY uploaded_at DESC
+                """,
+                (user_id,)
+            )
+
+            rows = cursor.fetchall()
+
+        files = []
+        for row in rows:
+            file_id, user_id, name, path, size, type, uploaded_at = row
+
+            file_path = self._sync_file_with_bucket(path)
+
+            # Check if file exists on disk
+            if os.path.exists(file_path):
+                files.append(FileModel(
+                    id=file_id,
+                    name=name,
+                    path=file_path,
+                    size=size,
+                    type=type,
+                    uploaded_at=uploaded_at,
+                    user_id=user_id
+                ))
+            else:
+                # File doesn't exist on disk, delete from database
+                self.delete_file(file_id)
+
+        return files
 
     def get_all_files(self) -> List[FileModel]:
         """
@@ -329,6 +465,8 @@ class FileService:
             with db_conenciton() as cursor:
                 cursor.execute("DELETE FROM files WHERE file_id = %s", (file_id,))
 
+            _clear_user_files_cache()
+
             return True
         except Exception as e:
             print(f"Error deleting file: {e}")
@@ -361,6 +499,8 @@ class FileService:
             with db_conenciton() as cursor:
                 cursor.execute("DELETE FROM files WHERE user_id = %s", (user_id,))
 
+            _clear_user_files_cache()
+
             return True
         except Exception as e:
             print(f"Error deleting user files: {e}")
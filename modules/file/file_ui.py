@@ -46,23 +46,28 @@ class FileUI:
             # Track if any files were successfully uploaded
             files_uploaded = False
 
+            # Get existing files once, indexed by name to check for duplicates
+            existing_by_name = {f.name: f for f in self.file_service.get_user_files(current_user.user_id)}
+
+            # File names per outcome, reported once after the upload
+            skipped_names = []
+            replaced_names = []
+            uploaded_names = []
+            failed_names = []
+
             # Process each uploaded file
             for uploaded_file in uploaded_files:
-                # Get existing files to check for duplicates
-                existing_files = self.file_service.get_user_files(current_user.user_id)
-                duplicate = any(f.name == uploaded_file.name for f in existing_files)
+                duplicate = existing_by_name.get(uploaded_file.name)
 
                 # Handle duplicates based on user preference
                 if duplicate and not replace_existing:
-                    st.warning(f"File '{uploaded_file.name}' already exists. Select 'Replace existing files' option to overwrite.")
+                    skipped_names.append(uploaded_file.name)
                     continue
                 elif duplicate and replace_existing:
                     # Delete existing file with the same name
-                    for existing_file in existing_files:
-                        if existing_file.name == uploaded_file.name:
-                            self.file_service.delete_file(existing_file.id)
-                            st.info(f"Replacing existing file: {uploaded_file.name}")
-                            break
+                    self.file_service.delete_file(duplicate.id)
+                    del existing_by_name[uploaded_file.name]
+                    replaced_names.append(uploaded_file.name)
 
                 # Add file to service
                 file_model = self.file_service.add_file(
@@ -73,10 +78,20 @@ class FileUI:
                 )
 
                 if file_model:
-                    st.success(f"Uploaded: {uploaded_file.name}")
+                    existing_by_name[uploaded_file.name] = file_model
+                    uploaded_names.append(uploaded_file.name)
                     files_uploaded = True
                 else:
-                    st.error(f"Failed to upload: {uploaded_file.name}")
+                    failed_names.append(uploaded_file.name)
+
+            if skipped_names:
+                st.warning(f"Already exist, select 'Replace existing files' option to overwrite: {', '.join(skipped_names)}")
+            if replaced_names:
+                st.info(f"Replaced existing files: {', '.join(replaced_names)}")
+            if uploaded_names:
+                st.success(f"Uploaded: {', '.join(uploaded_names)}")
+            if failed_names:
+                st.error(f"Failed to upload: {', '.join(failed_names)}")
 
             # Only rerun once all files are processed
             if files_uploaded:
@@ -86,6 +101,7 @@ class FileUI:
                     if st.form_submit_button("Clear and continue"):
                         st.rerun()
 
+    @st.fragment
     def render_file_management(self, current_user: Optional[User] = None) -> None:
         """
         Render the file management interface.
@@ -2,13 +2,34 @@
 Service for managing link operations in the application.
 """
 import uuid
-from typing import List, Optional
+import streamlit as st
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
 from modules.link.link_model import LinkModel
+from config.config import SOURCES_CACHE_TTL_IN_SECONDS
 from utils.db_conenciton import db_conenciton
 
 
+@st.cache_data(ttl=SOURCES_CACHE_TTL_IN_SECONDS, show_spinner=False)
+def _get_cached_user_links(_link_service: "LinkService", user_id: str) -> List[LinkModel]:
+    """Cache the links of a user, the service argument is excluded from the cache key."""
+    return _link_service._query_user_links(user_id)
+
+
+@st.cache_data(ttl=SOURCES_CACHE_TTL_IN_SECONDS, show_spinner=False)
+def _get_cached_user_link_options(_link_service: "LinkService", user_id: str) -> Tuple[Tuple[str, ...], Dict[str, LinkModel]]:
+    """Cache the link URLs of a user along with the links they select."""
+    options = {link.url: link for link in _get_cached_user_links(_link_service, user_id)}
+    return tuple(options), options
+
+
+def _clear_user_links_cache() -> None:
+    """Clear the cached links of all users after a change."""
+    _get_cached_user_links.clear()
+    _get_cached_user_link_options.clear()
+
+
 class LinkService:
     """
     Service for managing link operations.
@@ -75,6 +96,8 @@ class LinkService:
                     (link_id, user_id, url, description, added_at)
                 )
 
+            _clear_user_links_cache()
+
             return link_model
         except Exception as e:
             print(f"Error adding link: {e}")
@@ -120,7 +143,7 @@ class LinkService:
 
     def get_user_links(self, user_id: str) -> List[LinkModel]:
         """
-        Get all links for a specific user.
+        Get all links for a specific user, cached for a short time.
 
         Args:
             user_id: ID of the user
@@ -129,35 +152,63 @@ class LinkService:
             List[LinkModel]: List of link models
         """
         try:
-            with db_conenciton() as cursor:
-                cursor.execute(
-                    """
-                    SELECT link_id, user_id, url, description, added_at
-                    FROM links
-                    WHERE user_id = %s
-                    ORDER BY added_at DESC
-                    """,
-                    (user_id,)
-                )
-
-                rows = cursor.fetchall()
+            return _get_cached_user_links(self, user_id)
+        except Exception as e:
+            print(f"Error getting user links: {e}")
+            return []
 
-            links = []
-            for row in rows:
-                link_id, user_id, url, description, added_at = row
+    def get_user_link_options(self, user_id: str) -> Tuple[Tuple[str, ...], Dict[str, LinkModel]]:
+        """
+        Get the link URLs of a specific user to select from, cached for a short time.
 
-                links.append(LinkModel(
-                    id=link_id,
-                    url=url,
-                    description=description,
-                    added_at=added_at,
-                    user_id=user_id
-                ))
+        Args:
+            user_id: ID of the user
 
-            return links
+        Returns:
+            Tuple[Tuple[str, ...], Dict[str, LinkModel]]: The link URLs and the links mapped by URL
+        """
+        try:
+            return _get_cached_user_link_options(self, user_id)
         except Exception as e:
-            print(f"Error getting user links: {e}")
-            return []
+            print(f"Error getting user link options: {e}")
+            return (), {}
+
+    def _query_user_links(self, user_id: str) -> List[LinkModel]:
+        """
+        Query the database for all links of a specific user, raising on failure so errors are not cached.
+
+        Args:
+            user_id: ID of the user
+
+        Returns:
+            List[LinkModel]: List of link models
+        """
+        with db_conenciton() as cursor:
+            cursor.execute(
+                """
+                SELECT link_id, user_id, url, description, added_at
+                FROM links
+                WHERE user_id = %s
+                ORDER BY added_at DESC
+                """,
+                (user_id,)
+            )
+
+            rows = cursor.fetchall()
+
+        links = []
+        for row in rows:
+            link_id, user_id, url, description, added_at = row
+
+            links.append(LinkModel(
+                id=link_id,
+                url=url,
+                description=description,
+                added_at=added_at,
+                user_id=user_id
+            ))
+
+        return links
 
     def get_all_links(self) -> List[LinkModel]:
         """
@@ -209,6 +260,8 @@ class LinkService:
             with db_conenciton() as cursor:
                 cursor.execute("DELETE FROM links WHERE link_id = %s", (link_id,))
 
+            _clear_user_links_cache()
+
             return True
         except Exception as e:
             print(f"Error deleting link: {e}")
@@ -228,6 +281,8 @@ class LinkService:
             with db_conenciton() as cursor:
                 cursor.execute("DELETE FROM links WHERE user_id = %s", (user_id,))
 
+            _clear_user_links_cache()
+
             return True
         except Exception as e:
             print(f"Error deleting user links: {e}")
@@ -275,6 +330,8 @@ class LinkService:
                     (link.url, link.description, link_id)
                 )
 
+            _clear_user_links_cache()
+
             return link
         except Exception as e:
             print(f"Error updating link: {e}")
@@ -55,6 +55,7 @@ class LinkUI:
                 st.error(
                     "Please enter a valid URL starting with http:// or https://")
 
+    @st.fragment
     def render_link_management(self, current_user: Optional[User] = None) -> None:
         """
         Render the link management interface.
@@ -1,15 +1,15 @@
 """
 UI components for AI queries in the Streamlit application.
 """
-import os
-import json
 import streamlit as st
 from typing import Optional
 
+from config.config import HAS_OPENAI_API_KEY
 from prompts.conventional_query import run_conventional_query
 from modules.auth.auth_service import User
 from modules.file.file_service import FileService
 from modules.link.link_service import LinkService
+from utils.history import get_history_json
 from utils.vectorizer import vectorize
 
 
@@ -29,6 +29,7 @@ class ConventionalUI:
         self.file_service = file_service
         self.link_service = link_service
 
+    @st.fragment
     def render_query_section(self, current_user: Optional[User] = None) -> None:
         """
         Render the query input section.
@@ -42,7 +43,7 @@ class ConventionalUI:
             return
 
         # Check for API keys
-        if "OPENAI_API_KEY" not in os.environ:
+        if not HAS_OPENAI_API_KEY:
             st.warning(
                 "⚠️ OpenAI API key is not set in environment variables. Please ask your administrator to configure it.")
             return
@@ -65,19 +66,17 @@ class ConventionalUI:
             st.subheader("Select Files")
 
             if self.file_service and current_user:
-                # Get user files
-                user_files = self.file_service.get_user_files(
+                # Get user file names and the files they select
+                file_names, file_options = self.file_service.get_user_file_options(
                     current_user.user_id)
 
-                if not user_files:
+                if not file_names:
                     st.info("No files available. Upload files from the sidebar.")
                 else:
                     # Create a multiselect for files
-                    file_options = {
-                        f"{file.name}": file for file in user_files}
                     selected_file_names = st.multiselect(
                         "Choose files to include",
-                        options=list(file_options.keys()), key="files"
+                        options=file_names, key="files"
                     )
 
                     # Get the selected file objects
@@ -95,18 +94,17 @@ class ConventionalUI:
             st.subheader("Select Links")
 
             if self.link_service and current_user:
-                # Get user links
-                user_links = self.link_service.get_user_links(
+                # Get user link URLs and the links they select
+                link_urls, link_options = self.link_service.get_user_link_options(
                     current_user.user_id)
 
-                if not user_links:
+                if not link_urls:
                     st.info("No links available. Add links from the sidebar.")
                 else:
                     # Create a multiselect for links
-                    link_options = {f"{link.url}": link for link in user_links}
                     selected_link_urls = st.multiselect(
                         "Choose links to include",
-                        options=list(link_options.keys()), key="links"
+                        options=link_urls, key="links"
                     )
 
                     # Get the selected link objects
@@ -182,8 +180,7 @@ class ConventionalUI:
             st.download_button(
                 label="Download History",
                 key="conventional_chat_history_download",
-                data=json.dumps(
-                    st.session_state.conventional_history, indent=4),
+                data=get_history_json("conventional_history"),
                 file_name="conventional_chat_history.json",
                 mime="application/json",
             )
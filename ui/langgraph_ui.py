@@ -1,17 +1,77 @@
 """
 UI components for LangGraph RAG in the Streamlit application.
 """
-import json
-import os
 import streamlit as st
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
+from config.config import CHAT_HISTORY_VISIBLE_TURNS, HAS_OPENAI_API_KEY
+from graph.consts import GENERATE
 from modules.auth.auth_service import User
+from modules.file.file_model import FileModel
 from modules.file.file_service import FileService
+from modules.link.link_model import LinkModel
 from modules.link.link_service import LinkService
 from utils.ai_utils import get_retriever_id
+from utils.history import get_history_json
 from utils.vectorizer import vectorize
-from graph.graph import get_graph
+
+
+INTRO_MARKDOWN = """### Advanced Multi-Agent System with LangGraph
+
+This tab leverages an Adaptive RAG architecture that intelligently:
+
+1. **Routes Queries** - Uses an Agentic workflow to deliver precise answers.
+2. **Validates Information** - Evaluates retrieved documents against the original query for relevance and quality.
+3. **Generates Grounded Responses** - Creates answers based on verified information sources.
+4. **Prevents Hallucinations** - Implements a reflecting agent to ensure response accuracy.
+5. **Ensures Relevance** - Verifies that responses directly address your original question.
+6. **Web Search** - Searches the web for relevant websites if needed to check related spare parts or brands.
+
+
+Select specific files and links to include in your vector database.
+"""
+
+
+@st.cache_resource
+def get_compiled_graph():
+    """Compile the LangGraph workflow once per worker."""
+    from graph.graph import get_graph
+    return get_graph()
+
+
+def stream_generation(app, inputs: Dict[str, Any], placeholder) -> Dict[str, Any]:
+    """
+    Run the graph, showing the draft being written by the generate node in a placeholder.
+
+    Args:
+        app: Compiled LangGraph workflow
+        inputs: Initial graph state
+        placeholder: st.empty placeholder holding the current draft
+
+    Returns:
+        Dict[str, Any]: The final graph state
+    """
+    final_state = {}
+    message_id = None
+    draft = ""
+    for mode, chunk in app.stream(inputs, stream_mode=["messages", "values"]):
+        if mode == "values":
+            final_state = chunk
+            continue
+
+        message, metadata = chunk
+        if metadata.get("langgraph_node") != GENERATE or not message.content:
+            continue
+
+        # Each reflection round regenerates the answer, replacing the previous draft
+        if message.id != message_id:
+            message_id = message.id
+            draft = ""
+
+        draft += message.content
+        placeholder.chat_message("ai").write(draft)
+
+    return final_state
 
 
 class LangGraphUI:
@@ -30,6 +90,7 @@ class LangGraphUI:
         self.file_service = file_service
         self.link_service = link_service
 
+    @st.fragment
     def render_langgraph_section(self, current_user: Optional[User] = None) -> None:
         """
         Render the LangGraph RAG section.
@@ -43,27 +104,13 @@ class LangGraphUI:
             return
 
         # Check for API keys
-        if "OPENAI_API_KEY" not in os.environ:
+        if not HAS_OPENAI_API_KEY:
             st.warning(
                 "⚠️ OpenAI API key is not set in environment variables. Please ask your administrator to configure it.")
             return
 
         # Intro text explaining what LangGraph RAG is
-        st.markdown("""
-        ### Advanced Multi-Agent System with LangGraph
-        
-        This tab leverages an Adaptive RAG architecture that intelligently:
-
-        1. **Routes Queries** - Uses an Agentic workflow to deliver precise answers.
-        2. **Validates Information** - Evaluates retrieved documents against the original query for relevance and quality.
-        3. **Generates Grounded Responses** - Creates answers based on verified information sources.
-        4. **Prevents Hallucinations** - Implements a reflecting agent to ensure response accuracy.
-        5. **Ensures Relevance** - Verifies that responses directly address your original question.
-        6. **Web Search** - Searches the web for relevant websites if needed to check related spare parts or brands.
-
-
-        Select specific files and links to include in your vector database.
-        """)
+        st.markdown(INTRO_MARKDOWN)
 
         # Initialize session state for tracking run history
         if "langgraph_history" not in st.session_state:
@@ -80,19 +127,17 @@ class LangGraphUI:
             st.subheader("Select Files")
 
             if self.file_service and current_user:
-                # Get user files
-                user_files = self.file_service.get_user_files(
+                # Get user file names and the files they select
+                file_names, file_options = self.file_service.get_user_file_options(
                     current_user.user_id)
 
-                if not user_files:
+                if not file_names:
                     st.info("No files available. Upload files from the sidebar.")
                 else:
                     # Create a multiselect for files
-                    file_options = {
-                        f"{file.name}": file for file in user_files}
                     selected_file_names = st.multiselect(
                         "Choose files to include",
-                        options=list(file_options.keys())
+                        options=file_names
                     )
 
                     # Get the selected file objects
@@ -110,18 +155,17 @@ class LangGraphUI:
             st.subheader("Select Links")
 
             if self.link_service and current_user:
-                # Get user links
-                user_links = self.link_service.get_user_links(
+                # Get user link URLs and the links they select
+                link_urls, link_options = self.link_service.get_user_link_options(
                     current_user.user_id)
 
-                if not user_links:
+                if not link_urls:
                     st.info("No links available. Add links from the sidebar.")
                 else:
                     # Create a multiselect for links
-                    link_options = {f"{link.url}": link for link in user_links}
                     selected_link_urls = st.multiselect(
                         "Choose links to include",
-                        options=list(link_options.keys())
+                        options=link_urls
                     )
 
                     # Get the selected link objects
@@ -154,6 +198,17 @@ class LangGraphUI:
                     except Exception as e:
                         st.error(f"Error initializing vector store: {e}")
 
+        self._render_chat(selected_files, selected_links)
+
+    @st.fragment
+    def _render_chat(self, selected_files: List[FileModel], selected_links: List[LinkModel]) -> None:
+        """
+        Render the chat history and question input, rerunning on its own when a question is asked.
+
+        Args:
+            selected_files: Files selected for retrieval
+            selected_links: Links selected for retrieval
+        """
         # Query input
         st.subheader("Ask a Question")
 
@@ -169,9 +224,15 @@ class LangGraphUI:
                 for event in item["events"]:
                     messages.chat_message("ai").write(event)
 
-        if len(st.session_state.langgraph_history) > 0:
-            for item in st.session_state.langgraph_history:
-                display_result(item)
+        # Only the latest turns are rendered unless the user asks for the full history
+        history = st.session_state.langgraph_history
+        hidden_turns = max(len(history) - CHAT_HISTORY_VISIBLE_TURNS, 0)
+        if hidden_turns and not messages.toggle(
+                "Show earlier questions", key="langgraph_show_full_history"):
+            history = history[hidden_turns:]
+
+        for item in history:
+            display_result(item)
 
         if prompt := st.chat_input("Ask a Question"):
 
@@ -184,8 +245,9 @@ class LangGraphUI:
                 # Run the query through LangGraph, passing selected files and links
                 retriever_id = get_retriever_id(selected_files, selected_links)
                 inputs = {"question": prompt, "retriever_id": retriever_id}
-                app = get_graph()
-                final_state = app.invoke(inputs)
+                app = get_compiled_graph()
+                draft_placeholder = messages.empty()
+                final_state = stream_generation(app, inputs, draft_placeholder)
                 result = {
                     "question": prompt,
                     "answer": final_state["generation"],
@@ -194,6 +256,9 @@ class LangGraphUI:
 
                 # Store in history
                 st.session_state.langgraph_history.append(result)
+
+                # Replace the draft with the final answer, including any web search results
+                draft_placeholder.empty()
                 display_result(result, False)
 
         # Option to clear history
@@ -201,7 +266,7 @@ class LangGraphUI:
             st.download_button(
                 label="Download History",
                 key="rag_chat_history_download",
-                data=json.dumps(st.session_state.langgraph_history, indent=4),
+                data=get_history_json("langgraph_history"),
                 file_name="rag_chat_history.json",
                 mime="application/json",
             )
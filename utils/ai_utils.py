@@ -2,6 +2,7 @@
 OpenAI utils
 """
 
+import functools
 import os
 import chromadb
 from chromadb.utils.embedding_functions import SentenceTransformerEmbeddingFunction
@@ -10,7 +11,7 @@ from openai import OpenAI
 from sentence_transformers import CrossEncoder
 import streamlit as st
 
-from config.config import CHROMA_PATH
+from config.config import CHROMA_PATH, HAS_OPENAI_API_KEY
 from modules.file.file_model import FileModel
 from modules.link.link_model import LinkModel
 
@@ -19,7 +20,7 @@ EMPTY_RETRIEVER_ID = "default"
 # Check for environment variables
 def check_api_key():
     """Check if OpenAI API key is available"""
-    return "OPENAI_API_KEY" in os.environ
+    return HAS_OPENAI_API_KEY
 
 @st.cache_resource
 def get_ai_client():
@@ -31,10 +32,15 @@ def get_chroma_client():
 
 def get_retriever_id(files: list[FileModel], links: list[LinkModel]) -> str:
     """Generate a unique ID for a set of files and links"""
-    # Sort and combine file IDs and link IDs
-    file_ids = sorted([file.id for file in files]) if files else []
-    link_ids = sorted([link.id for link in links]) if links else []
+    # Sort file IDs and link IDs
+    file_ids = tuple(sorted(file.id for file in files)) if files else ()
+    link_ids = tuple(sorted(link.id for link in links)) if links else ()
 
+    return get_retriever_id_from_ids(file_ids, link_ids)
+
+@functools.lru_cache(maxsize=128)
+def get_retriever_id_from_ids(file_ids: tuple[str, ...], link_ids: tuple[str, ...]) -> str:
+    """Generate a unique ID from sorted file IDs and link IDs"""
     # Generate an ID by joining all file and link IDs
     # Max is 63 Charected, we add "rag-chroma-" at the start
     retriever_id = ("_".join(file_ids + link_ids))[:52]
@@ -27,6 +27,11 @@ def db_conenciton():
     conn = get_db_connection()
     cursor = conn.cursor()
 
-    yield cursor
+    try:
+        yield cursor
+    except Exception:
+        # Keep the shared connection usable after a failed statement
+        conn.rollback()
+        raise
 
     conn.commit()
@@ -0,0 +1,32 @@
+"""
+Chat history utils
+"""
+
+import json
+import streamlit as st
+
+
+def get_history_json(history_key: str) -> str:
+    """
+    Serialize a chat history stored in session state.
+
+    Histories are appended to in place and cleared by assigning a new list, so
+    the serialized JSON is kept in session state and only recomputed when the
+    history list or its length changes.
+
+    Args:
+        history_key: Session state key of the history list
+
+    Returns:
+        str: The history as indented JSON
+    """
+    history = st.session_state[history_key]
+    cache_key = f"{history_key}_json"
+
+    # The list itself is kept with the JSON, so a cleared history never matches
+    cached = st.session_state.get(cache_key)
+    if cached is None or cached[0] is not history or cached[1] != len(history):
+        cached = (history, len(history), json.dumps(history, indent=4))
+        st.session_state[cache_key] = cached
+
+    return cached[2]
@@ -98,3 +98,4 @@ def vectorize(files: list[FileModel] | None = None,
     else:
         print(f"Loading existing vector store for ID {retriever_id}...")
         return True
+